@@ -6,6 +6,7 @@ from typing import Optional
 
 import typer
 
+from simple_archive.simple_archive import ZipCompression, zip_compress_type
 from simple_archive.use_cases import CreateSimpleArchiveFromCSVWriteToPath
 
 app = typer.Typer()
@@ -16,8 +17,29 @@ def main(
     input_file: Path,
     output: Optional[Path] = None,
     create_zip: bool = typer.Option(False, "--zip"),
+    compresslevel: Optional[int] = typer.Option(
+        None,
+        "--compress-level",
+        help="Compression level for --zip, 0-9 for deflate and up to 22 for zstd, 1-3 is fast.",
+    ),
+    compression: ZipCompression = typer.Option(
+        ZipCompression.DEFLATE.value,
+        "--compression",
+        help="Compression method for --zip, zstd requires Python 3.14.",
+    ),
 ) -> None:
     """Create Simple Archive from an csv."""
+    if create_zip:
+        try:
+            zip_compress_type(compression, compresslevel)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc)) from exc
     logging.basicConfig(level=logging.DEBUG)
     uc = CreateSimpleArchiveFromCSVWriteToPath()
-    uc.execute(input_path=input_file, output_path=output, create_zip=create_zip)
+    uc.execute(
+        input_path=input_file,
+        output_path=output,
+        create_zip=create_zip,
+        compresslevel=compresslevel,
+        compression=compression,
+    )
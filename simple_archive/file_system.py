@@ -1,15 +1,53 @@
 """File system abstraction."""
 
 import abc
+import errno
 import logging
+import os
 import shutil
 import zipfile
 from io import TextIOWrapper
 from pathlib import Path
-from typing import IO
+from typing import IO, Optional
+
+from typing_extensions import Self
 
 logger = logging.getLogger(__name__)
 
+# errors from copy_file_range that mean "not supported here", use sendfile instead
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+# errors from sendfile that mean "not supported here", use shutil instead
+_SENDFILE_UNSUPPORTED = {errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK}
+_COPY_CHUNK_SIZE = 1 << 30
+
+# file types that don't get smaller by compressing them again
+COMPRESSED_SUFFIXES = frozenset(
+    {
+        ".7z",
+        ".bz2",
+        ".gif",
+        ".gz",
+        ".jpeg",
+        ".jpg",
+        ".mp3",
+        ".mp4",
+        ".ogg",
+        ".png",
+        ".webp",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+
+# creating directories and files relative to an open directory is not
+# available everywhere, e.g. not on Windows
+_SUPPORTS_DIR_FD = (
+    hasattr(os, "O_DIRECTORY")
+    and os.mkdir in os.supports_dir_fd
+    and os.open in os.supports_dir_fd
+)
+
 
 class FileSystem(abc.ABC):
     """Interface for working with a file system."""
@@ -30,9 +68,23 @@ class FileSystem(abc.ABC):
     def copy(self, src_path: Path, dst_path: str) -> None:
         """Copy src_path to dst_path."""
 
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """Write data to the file 'path'.
+
+        Args:
+            path (str): the relative path to write to
+            data (bytes): the data to write
+        """
+        with self.open_bytes(path) as file:
+            file.write(data)
+
 
 class PathFileSystem(FileSystem):
-    """File system for working with files relative to the given path."""
+    """File system for working with files relative to the given path.
+
+    Used as a context manager, output_path is opened once and directories and
+    files are created relative to it, where the platform supports that.
+    """
 
     def __init__(self, output_path: Path) -> None:
         """Create a file system relative to the given path.
@@ -41,6 +93,20 @@ class PathFileSystem(FileSystem):
             output_path (Path): the path to work with
         """
         self.output_path = output_path
+        self._dir_fd: Optional[int] = None
+
+    def __enter__(self) -> Self:
+        """Open output_path, creating it if needed."""
+        if _SUPPORTS_DIR_FD:
+            self._ensure_path(self.output_path)
+            self._dir_fd = os.open(self.output_path, os.O_RDONLY | os.O_DIRECTORY)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close output_path."""
+        if self._dir_fd is not None:
+            os.close(self._dir_fd)
+            self._dir_fd = None
 
     @classmethod
     def _ensure_path(cls, path: Path) -> None:
@@ -53,6 +119,13 @@ class PathFileSystem(FileSystem):
             path (str): the relative path
         """
         logger.info("creating '%s' ...", path)
+        if self._dir_fd is not None:
+            try:
+                os.mkdir(path, dir_fd=self._dir_fd)
+            except FileNotFoundError:
+                pass
+            else:
+                return
         _path = self.output_path / path
         _path.mkdir(parents=True, exist_ok=False)
 
@@ -67,9 +140,7 @@ class PathFileSystem(FileSystem):
         Returns:
             IO[str]: the open file
         """
-        _path = self.output_path / path
-        self._ensure_path(_path.parent)
-        return _path.open(mode="w", encoding="utf-8")
+        return open(self._open_fd(path), "w", encoding="utf-8")  # noqa: PTH123
 
     def open_bytes(self, path: str) -> IO[bytes]:
         """Open a file for writing bytes relative to output_path.
@@ -82,9 +153,7 @@ class PathFileSystem(FileSystem):
         Returns:
             IO[bytes]: the open file
         """
-        _path = self.output_path / path
-        self._ensure_path(_path.parent)
-        return _path.open(mode="wb")
+        return open(self._open_fd(path), "wb")  # noqa: PTH123
 
     def copy(self, src_path: Path, dst_path: str) -> None:
         """Copy dst_path to src_path relative to this path.
@@ -93,9 +162,20 @@ class PathFileSystem(FileSystem):
             src_path (Path): the path to copy
             dst_path (str): the relative path to copy to
         """
-        dst = self.output_path / dst_path
-        self._ensure_path(dst.parent)
-        shutil.copy(src_path, dst)
+        # open the source first, so a missing file leaves no empty copy behind
+        with src_path.open("rb") as src_file, self.open_bytes(dst_path) as dst_file:
+            copy_file(src_file, dst_file)
+
+    def _open_fd(self, path: str) -> int:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        if self._dir_fd is not None:
+            try:
+                return os.open(path, flags, 0o666, dir_fd=self._dir_fd)
+            except FileNotFoundError:
+                pass
+        _path = self.output_path / path
+        self._ensure_path(_path.parent)
+        return os.open(_path, flags, 0o666)
 
 
 class ZipFileSystem(FileSystem):
@@ -133,11 +213,59 @@ class ZipFileSystem(FileSystem):
         """
         return self.zipf.open(path, "w")
 
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """Write data to the relative path in one go.
+
+        Args:
+            path (str): the relative path
+            data (bytes): the data to write
+        """
+        self.zipf.writestr(path, data)
+
     def copy(self, src_path: Path, dst_path: str) -> None:
         """Copy the src_path to relative path dst_path.
 
+        Files that are already compressed, judging by their suffix, are stored
+        as is.
+
         Args:
             src_path (Path): the source path
             dst_path (str): the relative destination path
         """
-        self.zipf.write(src_path, dst_path)
+        compress_type = (
+            zipfile.ZIP_STORED if src_path.suffix.lower() in COMPRESSED_SUFFIXES else None
+        )
+        self.zipf.write(src_path, dst_path, compress_type=compress_type)
+
+
+def copy_file(src_file: IO[bytes], dst_file: IO[bytes]) -> None:
+    """Copy the contents of src_file to dst_file.
+
+    Uses os.copy_file_range where available so that the data never passes
+    through user space, otherwise os.sendfile (e.g. across file systems) and
+    last shutil.copyfileobj. Unlike shutil.copy no permission bits are copied.
+
+    Args:
+        src_file (IO[bytes]): the file to copy, opened for reading
+        dst_file (IO[bytes]): the file to copy to, opened for writing
+    """
+    src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK_SIZE):
+                pass
+        except OSError as exc:
+            if exc.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                raise
+        else:
+            return
+    if hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(dst_fd, src_fd, None, _COPY_CHUNK_SIZE):
+                pass
+        except OSError as exc:
+            if exc.errno not in _SENDFILE_UNSUPPORTED:
+                raise
+        else:
+            return
+    shutil.copyfileobj(src_file, dst_file)
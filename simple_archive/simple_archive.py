@@ -1,13 +1,19 @@
 """Model for Simple Archive."""
 
 import csv
+import enum
+import functools
 import logging
 import re
+import sys
 import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import partial
 from pathlib import Path
-from typing import IO, Any, Optional, Union
-from xml.etree.ElementTree import Element, ElementTree, SubElement
+from typing import IO, Any, NamedTuple, Optional, Union
+from xml.sax.saxutils import escape
 
 import pydantic
 from typing_extensions import Self
@@ -18,12 +24,46 @@ from simple_archive.file_system import (
     ZipFileSystem,
 )
 
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover
+    from xml.etree import ElementTree as etree  # type: ignore[no-redef]  # noqa: N813
+
 DEFAULT_ENCODING = "utf-8"
+CSV_BUFFER_SIZE = 1 << 20
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+
+# lxml and xml.etree expose the same API for what we use, but not the same types
+_Element = Any
+_ElementTree = Any
 
 
 logger = logging.getLogger(__name__)
 
 
+class ZipCompression(str, enum.Enum):
+    """Compression methods for zip archives."""
+
+    DEFLATE = "deflate"
+    ZSTD = "zstd"
+    STORE = "store"
+
+
+ZIP_COMPRESS_TYPES = {
+    ZipCompression.DEFLATE: zipfile.ZIP_DEFLATED,
+    ZipCompression.STORE: zipfile.ZIP_STORED,
+}
+# valid compresslevels, stored archives take none
+ZIP_COMPRESSLEVELS = {ZipCompression.DEFLATE: range(10)}
+# zstd in zip archives is supported from Python 3.14
+if sys.version_info >= (3, 14):  # pragma: no cover
+    from compression.zstd import CompressionParameter
+
+    ZIP_COMPRESS_TYPES[ZipCompression.ZSTD] = zipfile.ZIP_ZSTANDARD
+    _min_level, _max_level = CompressionParameter.compression_level.bounds()
+    ZIP_COMPRESSLEVELS[ZipCompression.ZSTD] = range(_min_level, _max_level + 1)
+
+
 class DublinCoreDate(pydantic.BaseModel):
     """Dublin Core Date model."""
 
@@ -42,6 +82,33 @@ class DublinCoreElement(pydantic.BaseModel):
 LANGUAGE_IN_SQUARE_BRACKETS = re.compile(r"\[([a-zA-Z_]+)\]")
 
 
+def split_language(key: str) -> tuple[str, Optional[str]]:
+    """Split a key like 'description[sv_SE]' in element and language.
+
+    >>> split_language('description[sv_SE]')
+    ('description', 'sv_SE')
+    >>> split_language('description')
+    ('description', None)
+
+    Args:
+        key (str): the key to split
+
+    Returns:
+        tuple[str, Optional[str]]: the element and the language if any
+    """
+    lb = key.find("[")
+    if lb == -1:
+        return key, None
+    rb = key.find("]", lb)
+    language = key[lb + 1 : rb]
+    # plain string checks handle the common form, the regex handles the rest
+    if rb != -1 and language.isascii() and language.replace("_", "").isalpha():
+        return key[:lb], language
+    if lang := LANGUAGE_IN_SQUARE_BRACKETS.search(key):
+        return key[: lang.start()], lang.group(1)
+    return key, None
+
+
 class DublinCore(pydantic.RootModel):
     """Dublin Core model."""
 
@@ -56,9 +123,11 @@ class DublinCore(pydantic.RootModel):
         for key, value in values.items():
             if isinstance(value, str):
                 new_value = {"element": key, "value": value}
-                if lang := LANGUAGE_IN_SQUARE_BRACKETS.search(key):
-                    new_value["element"] = key[: lang.start()]
-                    new_value["language"] = lang.group(1)
+                if "[" in key:
+                    element, language = split_language(key)
+                    if language:
+                        new_value["element"] = element
+                        new_value["language"] = language
                 new_values.append(new_value)
             elif isinstance(value, dict):
                 new_value = {"element": key}
@@ -74,7 +143,7 @@ class DublinCore(pydantic.RootModel):
         return new_values
 
 
-def build_xml(dc: DublinCore, *, schema: str) -> ElementTree:
+def build_xml(dc: DublinCore, *, schema: str) -> _ElementTree:
     """Build an ElementTree from a DublinCore model.
 
     Args:
@@ -84,7 +153,11 @@ def build_xml(dc: DublinCore, *, schema: str) -> ElementTree:
     Returns:
         ElementTree: the resulting ElementTree
     """
-    root = Element("dublin_core", attrib={"schema": schema})
+    root = etree.Element("dublin_core", schema=schema)
+    # Children must be created in place with SubElement (see dcvalue). Creating
+    # standalone elements and appending them makes lxml merge documents on each
+    # append, which is quadratic in the number of dcvalues. Should a namespace
+    # ever be needed, declare it once on root so all children inherit it.
     for element in dc.root:
         dcvalue(
             root,
@@ -93,18 +166,20 @@ def build_xml(dc: DublinCore, *, schema: str) -> ElementTree:
             language=element.language,
             text=element.value,
         )
-    return ElementTree(root)
+    return etree.ElementTree(root)
 
 
 def dcvalue(
-    parent: Element,
+    parent: _Element,
     element: str,
     qualifier: Optional[str] = None,
     language: Optional[str] = None,
     text: Optional[str] = None,
-) -> Element:
+) -> _Element:
     """Create a dcvalue subelement of parent.
 
+    The element is always created inside parent's document, never detached.
+
     Args:
         parent (Element): the element to use as parent
         element (str): the element tag
@@ -115,13 +190,14 @@ def dcvalue(
     Returns:
         Element: _description_
     """
-    attribs = {
-        "element": element,
-        "qualifier": qualifier or "none",
-    }
     if language:
-        attribs["language"] = language
-    elem = SubElement(parent, "dcvalue", attrib=attribs)
+        elem = etree.SubElement(
+            parent, "dcvalue", element=element, qualifier=qualifier or "none", language=language
+        )
+    else:
+        elem = etree.SubElement(
+            parent, "dcvalue", element=element, qualifier=qualifier or "none"
+        )
     if text:
         elem.text = text
     return elem
@@ -160,6 +236,12 @@ class Metadata(pydantic.BaseModel):
         return v
 
 
+@functools.lru_cache(maxsize=1024)
+def _split_key(key: str) -> tuple[str, ...]:
+    """Split a flat key like 'dc.date.issued', the same keys repeat for every row."""
+    return tuple(key.split("."))
+
+
 class Item(pydantic.BaseModel):
     """Simple Archive Item model."""
 
@@ -194,28 +276,114 @@ class Item(pydantic.BaseModel):
     @pydantic.model_validator(mode="before")
     @classmethod
     def unflatten_values(cls, values: Any) -> dict:  # noqa: D102
-        nested: dict = {}
+        if isinstance(values.get("metadata"), dict) and values.keys() <= {"files", "metadata"}:
+            # already nested, e.g. from SimpleArchive.from_csv_path
+            return values
+        metadata: dict = {}
+        new_values: dict = {"metadata": metadata}
         for key, value in values.items():
-            parts = key.split(".")
-            sub = nested
-
+            if key == "files" or ("." not in key and isinstance(value, pydantic.BaseModel)):
+                new_values[key] = value
+                continue
+            parts = _split_key(key)
+            sub = metadata
             for part in parts[:-1]:
                 if part not in sub:
                     sub[part] = {}
                 sub = sub[part]
-
             sub[parts[-1]] = value
-        new_values: dict = {"metadata": {}}
-        for key, value in nested.items():
-            if key == "files":
-                new_values["files"] = value
-            elif isinstance(value, pydantic.BaseModel):
-                new_values[key] = value
-            else:
-                new_values["metadata"][key] = value
         return new_values
 
 
+class _Column(NamedTuple):
+    idx: int
+    namespace: str
+    element: dict[str, str]
+
+
+def _plan_columns(header: list[str]) -> Optional[list[_Column]]:
+    """Work out which DublinCoreElement each metadata column becomes.
+
+    Returns None for headers where the columns don't map one-to-one to
+    elements, e.g. several columns for the same element.
+    """
+    if header.count("files") != 1:
+        return None
+    columns = []
+    seen = set()
+    for idx, key in enumerate(header):
+        if key == "files":
+            continue
+        parts = key.split(".")
+        if len(parts) == 2:  # noqa: PLR2004
+            element, language = split_language(parts[1])
+            qualifier = None
+        elif len(parts) == 3 and parts[2] not in {"value", "language"}:  # noqa: PLR2004
+            element, qualifier, language = parts[1], parts[2], None
+        else:
+            return None
+        if (parts[0], parts[1]) in seen:
+            return None
+        seen.add((parts[0], parts[1]))
+        elem = {"element": element}
+        if qualifier is not None:
+            elem["qualifier"] = qualifier
+        if language is not None:
+            elem["language"] = language
+        columns.append(_Column(idx, parts[0], elem))
+    return columns
+
+
+def _rows_to_items(header: list[str], rows: Iterable[list[str]]) -> Iterator[Item]:
+    """Create items from csv rows.
+
+    The header is analysed once. For the common header shapes every row is
+    then turned into lists of DublinCoreElement data, otherwise into the
+    nested dict that DublinCore.build_list_from_dict_if_needed expects.
+
+    Args:
+        header (list[str]): the csv header
+        rows (Iterable[list[str]]): the csv rows
+
+    Empty rows are skipped, like csv.DictReader does.
+
+    Yields:
+        Item: an item per row
+
+    Raises:
+        ValueError: if a row doesn't have as many values as the header
+    """
+    columns = _plan_columns(header)
+    files_idx = header.index("files") if columns is not None else -1
+    split_header = [key.split(".") for key in header]
+    # the header is row 1
+    for row_nr, row in enumerate(rows, start=2):
+        if not row:
+            continue
+        if len(row) != len(header):
+            raise ValueError(
+                f"row {row_nr} has {len(row)} values, but the header has {len(header)} columns"
+            )
+        if columns is not None:
+            dublin_cores: dict[str, list] = {}
+            for column in columns:
+                element = {**column.element, "value": row[column.idx]}
+                dublin_cores.setdefault(column.namespace, []).append(element)
+            yield Item.model_validate({"files": row[files_idx], "metadata": dublin_cores})
+            continue
+        metadata: dict = {}
+        nested: dict = {"metadata": metadata}
+        for parts, value in zip(split_header, row):
+            if parts == ["files"]:
+                nested["files"] = value
+                continue
+            sub = metadata
+            for part in parts[:-1]:
+                sub = sub.setdefault(part, {})
+            sub[parts[-1]] = value
+        yield Item.model_validate(nested)
+
+
 class SimpleArchive:
     """Simple Archive model."""
 
@@ -225,39 +393,68 @@ class SimpleArchive:
 
     @classmethod
     def from_csv_path(cls, csv_path: Path) -> "SimpleArchive":  # noqa: D102
-        items = []
-        with open(csv_path, encoding=DEFAULT_ENCODING, newline="") as csvfile:  # noqa: PTH123
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                item = Item(**row)
-                items.append(item)
+        with open(  # noqa: PTH123
+            csv_path, encoding=DEFAULT_ENCODING, newline="", buffering=CSV_BUFFER_SIZE
+        ) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            items = list(_rows_to_items(header, reader))
         return cls(input_folder=csv_path.parent, items=items)
 
     def write_to_path(self, output_path: Path) -> None:  # noqa: D102
-        path_fs = PathFileSystem(output_path)
-        self._write_to_fs(path_fs)
-
-    def write_to_zip(self, output_path: Path) -> None:  # noqa: D102
-        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        # items are independent and the work is mostly blocking I/O
+        with PathFileSystem(output_path) as path_fs, ThreadPoolExecutor() as executor:
+            # consume the results to re-raise any error from the workers
+            list(
+                executor.map(
+                    partial(self._write_item, fs=path_fs), range(len(self.items)), self.items
+                )
+            )
+
+    def write_to_zip(
+        self,
+        output_path: Path,
+        compresslevel: Optional[int] = None,
+        compression: ZipCompression = ZipCompression.DEFLATE,
+    ) -> None:
+        """Write this archive as a zip file.
+
+        Args:
+            output_path (Path): the zip file to write
+            compresslevel (Optional[int], optional): the compression level. For
+                deflate 0-9, where 1-3 is fast, 6 is the default and 9 gives the
+                smallest archive. For zstd up to 22, where 1-5 is fast, 3 is the
+                default and higher levels give smaller archives. Stored archives
+                take no level. Defaults to None, the default level.
+            compression (ZipCompression, optional): the compression method.
+                Defaults to deflate.
+
+        Raises:
+            ValueError: see zip_compress_type
+        """
+        # check before creating the zip file, so that no partial archive is left
+        compress_type = zip_compress_type(compression, compresslevel)
+        with zipfile.ZipFile(
+            output_path, "w", compression=compress_type, compresslevel=compresslevel
+        ) as zipf:
             zip_fs = ZipFileSystem(zipf)
-            self._write_to_fs(zip_fs)
+            # a ZipFile can only be written by one thread at a time
+            for item_nr, item in enumerate(self.items):
+                self._write_item(item_nr, item, zip_fs)
 
-    def _write_to_fs(self, fs: FileSystem) -> None:
-        for item_nr, item in enumerate(self.items):
-            item_path = f"item_{item_nr:03d}"
-            fs.mkdir(item_path)
+    def _write_item(self, item_nr: int, item: Item, fs: FileSystem) -> None:
+        item_path = f"item_{item_nr:03d}"
+        fs.mkdir(item_path)
 
-            self._write_contents_file(item, item_path, fs)
-            self._copy_files(item, item_path, fs)
-            self._write_metadata(item.metadata, item_path, fs)
+        self._write_contents_file(item, item_path, fs)
+        self._copy_files(item, item_path, fs)
+        self._write_metadata(item.metadata, item_path, fs)
 
     def _write_contents_file(self, item: Item, item_path: str, fs: FileSystem) -> None:  # noqa: PLR6301
         contents_path = f"{item_path}/contents"
         logger.info("writing '%s'", contents_path)
-        with fs.open_text(contents_path) as contents_file:
-            for file_path in item.files:
-                contents_file.write(file_path.name)
-                contents_file.write("\n")
+        contents = "".join(f"{file_path.name}\n" for file_path in item.files)
+        fs.write_bytes(contents_path, contents.encode(DEFAULT_ENCODING))
 
     def _copy_files(self, item: Item, item_path: str, fs: FileSystem) -> None:
         for file_path in item.files:
@@ -267,22 +464,56 @@ class SimpleArchive:
             fs.copy(src_path, dst_path)
 
     def _write_metadata(self, metadata: Metadata, item_path: str, fs: FileSystem) -> None:  # noqa: PLR6301
-        with fs.open_bytes(f"{item_path}/dublin_core.xml") as dc_file:
-            build_and_write_metadata(metadata.dc, schema="dc", path_or_file=dc_file)
+        fs.write_bytes(
+            f"{item_path}/dublin_core.xml", serialize_dc_xml(metadata.dc, schema="dc")
+        )
 
         if metadata.local:
-            with fs.open_bytes(f"{item_path}/metadata_local.xml") as local_file:
-                build_and_write_metadata(metadata.local, schema="local", path_or_file=local_file)
+            fs.write_bytes(
+                f"{item_path}/metadata_local.xml",
+                serialize_dc_xml(metadata.local, schema="local"),
+            )
         if metadata.dcterms:
-            with fs.open_bytes(f"{item_path}/metadata_dcterms.xml") as dcterms_file:
-                build_and_write_metadata(
-                    metadata.dcterms, schema="dcterms", path_or_file=dcterms_file
-                )
+            fs.write_bytes(
+                f"{item_path}/metadata_dcterms.xml",
+                serialize_dc_xml(metadata.dcterms, schema="dcterms"),
+            )
         if metadata.metashare:
-            with fs.open_bytes(f"{item_path}/metadata_metashare.xml") as metashare_file:
-                build_and_write_metadata(
-                    metadata.metashare, schema="metashare", path_or_file=metashare_file
-                )
+            fs.write_bytes(
+                f"{item_path}/metadata_metashare.xml",
+                serialize_dc_xml(metadata.metashare, schema="metashare"),
+            )
+
+
+def zip_compress_type(compression: ZipCompression, compresslevel: Optional[int] = None) -> int:
+    """Check compression and compresslevel and get the zipfile compress type.
+
+    Args:
+        compression (ZipCompression): the compression method
+        compresslevel (Optional[int], optional): the compression level, see
+            SimpleArchive.write_to_zip. Defaults to None.
+
+    Returns:
+        int: the compress type to give zipfile
+
+    Raises:
+        ValueError: if zstd is requested and not supported by zipfile, or
+            compresslevel is not valid for the compression method
+    """
+    compression = ZipCompression(compression)
+    compress_type = ZIP_COMPRESS_TYPES.get(compression)
+    if compress_type is None:
+        raise ValueError(f"compression '{compression.value}' requires Python 3.14 or later")
+    if compresslevel is not None:
+        levels = ZIP_COMPRESSLEVELS.get(compression)
+        if levels is None:
+            raise ValueError(f"compression '{compression.value}' takes no compresslevel")
+        if compresslevel not in levels:
+            raise ValueError(
+                f"compresslevel for '{compression.value}' must be between"
+                f" {levels.start} and {levels.stop - 1}, got {compresslevel}"
+            )
+    return compress_type
 
 
 def build_and_write_metadata(
@@ -295,5 +526,65 @@ def build_and_write_metadata(
         schema (str): schema to use
         path_or_file (Union[Path, IO[bytes]]): path or file to write to
     """
+    data = serialize_metadata(metadata, schema=schema)
+    if isinstance(path_or_file, Path):
+        path_or_file.write_bytes(data)
+    else:
+        path_or_file.write(data)
+
+
+def serialize_metadata(metadata: DublinCore, schema: str) -> bytes:
+    """Build metadata and serialize it, including the xml declaration.
+
+    Args:
+        metadata (DublinCore): metadata to build
+        schema (str): schema to use
+
+    Returns:
+        bytes: the utf-8 encoded xml document
+    """
     metadata_xml = build_xml(metadata, schema=schema)
-    metadata_xml.write(path_or_file, encoding="utf-8", xml_declaration=True)
+    return XML_DECLARATION + etree.tostring(
+        metadata_xml.getroot(), encoding=DEFAULT_ENCODING, xml_declaration=False
+    )
+
+
+# escapes that lxml applies on top of &, < and >
+_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+_TEXT_ENTITIES = {"\r": "&#13;"}
+
+
+def _quote_attribute(value: str) -> str:
+    return f'"{escape(value, _ATTRIBUTE_ENTITIES)}"'
+
+
+def serialize_dc_xml(dc: DublinCore, schema: str) -> bytes:
+    """Serialize a DublinCore model without building an element tree.
+
+    Gives the same document as serialize_metadata does with lxml.
+
+    Args:
+        dc (DublinCore): metadata to serialize
+        schema (str): schema to use
+
+    Returns:
+        bytes: the utf-8 encoded xml document
+    """
+    parts = [f"<dublin_core schema={_quote_attribute(schema)}"]
+    if not dc.root:
+        parts.append("/>")
+    else:
+        parts.append(">")
+        for element in dc.root:
+            parts.append(
+                f"<dcvalue element={_quote_attribute(element.element)}"
+                f" qualifier={_quote_attribute(element.qualifier or 'none')}"
+            )
+            if element.language:
+                parts.append(f" language={_quote_attribute(element.language)}")
+            if element.value:
+                parts.append(f">{escape(element.value, _TEXT_ENTITIES)}</dcvalue>")
+            else:
+                parts.append("/>")
+        parts.append("</dublin_core>")
+    return XML_DECLARATION + "".join(parts).encode(DEFAULT_ENCODING)
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional, Union
 
 from simple_archive import SimpleArchive
+from simple_archive.simple_archive import ZipCompression, zip_compress_type
 
 
 class CreateSimpleArchiveFromCSVWriteToPath:
@@ -14,6 +15,8 @@ class CreateSimpleArchiveFromCSVWriteToPath:
         input_path: Path,
         output_path: Optional[Path] = None,
         create_zip: bool = False,
+        compresslevel: Optional[int] = None,
+        compression: ZipCompression = ZipCompression.DEFLATE,
     ) -> None:
         """Create a Simple Archive from a CSV file and write to Path.
 
@@ -21,6 +24,11 @@ class CreateSimpleArchiveFromCSVWriteToPath:
             input_path (Path): path to csv file
             output_path (Optional[Path], optional): A directory or an filename with extension '.zip'. Defaults to None.
             create_zip (bool, optional): if True writes a zip file. Defaults to False.
+            compresslevel (Optional[int], optional): compression level for the zip file, see SimpleArchive.write_to_zip. Defaults to None.
+            compression (ZipCompression, optional): compression method for the zip file. Defaults to deflate.
+
+        Raises:
+            ValueError: if compression or compresslevel is not valid, see zip_compress_type
         """  # noqa: E501
         if not output_path:
             output_path = create_unique_path(
@@ -29,6 +37,8 @@ class CreateSimpleArchiveFromCSVWriteToPath:
         elif output_path.suffix == "zip":
             create_zip = True
         if create_zip:
+            # fail before creating any output or reading the csv
+            zip_compress_type(compression, compresslevel)
             output_path.parent.mkdir(parents=True, exist_ok=True)
         else:
             output_path.mkdir(parents=True, exist_ok=False)
@@ -36,7 +46,9 @@ class CreateSimpleArchiveFromCSVWriteToPath:
         simple_archive = SimpleArchive.from_csv_path(input_path)
 
         if create_zip:
-            simple_archive.write_to_zip(output_path)
+            simple_archive.write_to_zip(
+                output_path, compresslevel=compresslevel, compression=compression
+            )
         else:
             simple_archive.write_to_path(output_path)
 
@@ -52,9 +64,14 @@ def create_unique_path(base_path: Path, base_stem: str, suffix: Optional[str] =
     Returns:
         Path: an unique path in base_path
     """
+    # list base_path once instead of checking every candidate with a stat,
+    # compare casefolded names since the file system may be case-insensitive
+    existing = (
+        {path.name.casefold() for path in base_path.iterdir()} if base_path.is_dir() else set()
+    )
     new_path = mk_path(base_path, base_stem, suffix)
     counter = 1
-    while new_path.exists():
+    while new_path.name.casefold() in existing:
         new_path = mk_path(base_path, f"{base_stem}.{counter:03d}", suffix)
         counter += 1
     return new_path
@@ -1,6 +1,11 @@
-from xml.etree import ElementTree
-
-from simple_archive.simple_archive import DublinCore, build_xml
+from simple_archive.simple_archive import (
+    DublinCore,
+    DublinCoreElement,
+    build_xml,
+    etree,
+    serialize_dc_xml,
+    serialize_metadata,
+)
 
 
 def test_dublin_core() -> None:
@@ -8,7 +13,7 @@ def test_dublin_core() -> None:
     dc = DublinCore(**data)  # type:ignore[arg-type]
 
     tree = build_xml(dc, schema="dc")
-    xml = ElementTree.tostring(tree.getroot())
+    xml = etree.tostring(tree.getroot())
 
     assert (
         xml
@@ -21,7 +26,7 @@ def test_dublin_core_with_language() -> None:
     dc = DublinCore(**data)  # type:ignore[arg-type]
 
     tree = build_xml(dc, schema="dc")
-    xml = ElementTree.tostring(tree.getroot())
+    xml = etree.tostring(tree.getroot())
 
     assert (
         xml
@@ -34,9 +39,26 @@ def test_dublin_core_with_language_in_square_brackets() -> None:
     dc = DublinCore(**data)  # type:ignore[arg-type]
 
     tree = build_xml(dc, schema="dc")
-    xml = ElementTree.tostring(tree.getroot())
+    xml = etree.tostring(tree.getroot())
 
     assert (
         xml
         == b'<dublin_core schema="dc"><dcvalue element="description" qualifier="none" language="sv_SE">beskrivning</dcvalue></dublin_core>'  # noqa: E501
     )
+
+
+def test_serialize_dc_xml() -> None:
+    dc = DublinCore(
+        root=[
+            DublinCoreElement(element="title", value='Tom & "Jerry" <3', language="en"),
+            DublinCoreElement(element="date", qualifier="issued", value="2024-05-24"),
+        ]
+    )
+
+    xml = serialize_dc_xml(dc, schema="dc")
+
+    assert (
+        xml
+        == b'<?xml version=\'1.0\' encoding=\'utf-8\'?>\n<dublin_core schema="dc"><dcvalue element="title" qualifier="none" language="en">Tom &amp; "Jerry" &lt;3</dcvalue><dcvalue element="date" qualifier="issued">2024-05-24</dcvalue></dublin_core>'  # noqa: E501
+    )
+    assert xml == serialize_metadata(dc, schema="dc")
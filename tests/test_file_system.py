@@ -0,0 +1,40 @@
+import errno
+import os
+from pathlib import Path
+
+import pytest
+
+from simple_archive.file_system import PathFileSystem
+
+
+def test_path_file_system_copy(tmp_path: Path) -> None:
+    src = tmp_path / "simple.txt"
+    src.write_bytes(b"simple " * 1000)
+
+    with PathFileSystem(tmp_path / "output") as fs:
+        fs.copy(src, "item_000/simple.txt")
+
+    assert (tmp_path / "output/item_000/simple.txt").read_bytes() == b"simple " * 1000
+
+
+def test_path_file_system_copy_falls_back_across_file_systems(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def copy_file_range(*_args: object) -> int:
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+    src = tmp_path / "simple.txt"
+    src.write_bytes(b"simple " * 1000)
+
+    with PathFileSystem(tmp_path / "output") as fs:
+        fs.copy(src, "item_000/simple.txt")
+
+    assert (tmp_path / "output/item_000/simple.txt").read_bytes() == b"simple " * 1000
+
+
+def test_path_file_system_copy_missing_file(tmp_path: Path) -> None:
+    with PathFileSystem(tmp_path / "output") as fs, pytest.raises(FileNotFoundError):
+        fs.copy(tmp_path / "missing.txt", "item_000/missing.txt")
+
+    assert not (tmp_path / "output/item_000/missing.txt").exists()
@@ -5,6 +5,7 @@ from io import BytesIO
 from pathlib import Path
 from typing import Optional
 
+import pydantic
 import pytest
 
 from simple_archive.simple_archive import (
@@ -13,6 +14,7 @@ from simple_archive.simple_archive import (
     Item,
     Metadata,
     SimpleArchive,
+    ZipCompression,
     build_and_write_metadata,
 )
 
@@ -30,6 +32,12 @@ def test_item() -> None:
     assert item == expected
 
 
+def test_item_rejects_flat_keys_next_to_nested_metadata() -> None:
+    values = {"files": "", "metadata": {"dc": {"title": "A"}}, "dc.description": "lost"}
+    with pytest.raises(pydantic.ValidationError):
+        Item(**values)
+
+
 def test_dublin_core_with_language() -> None:
     data = {
         "files": "",
@@ -46,6 +54,54 @@ def test_dublin_core_with_language() -> None:
     )
 
 
+def test_simple_archive_from_csv_path() -> None:
+    simple_archive = SimpleArchive.from_csv_path(Path("tests/data/simple.csv"))
+
+    assert simple_archive.input_folder == Path("tests/data")
+    assert simple_archive.items == [
+        Item(
+            **{
+                "files": "values.txt",
+                "dc.title": "Simple",
+                "dc.description[sv_SE]": "beskrivning",
+                "dc.date.issued": "2024-05-24",
+                "local.size.info": "2@@tokens",
+            }
+        ),
+        Item(
+            **{
+                "files": "",
+                "dc.title": "Empty",
+                "dc.description[sv_SE]": "",
+                "dc.date.issued": "2024-05-24",
+                "local.size.info": "0@@tokens",
+            }
+        ),
+    ]
+    assert simple_archive.items[0].files == [Path("values.txt")]
+    assert simple_archive.items[1].files == []
+
+
+def test_simple_archive_from_csv_path_skips_empty_lines(tmp_path: Path) -> None:
+    csv_path = tmp_path / "simple.csv"
+    csv_path.write_text("files,dc.title\n,A\n\n,B\n\n", encoding="utf-8")
+
+    simple_archive = SimpleArchive.from_csv_path(csv_path)
+
+    assert [item.metadata.dc.root[0].value for item in simple_archive.items] == ["A", "B"]
+
+
+@pytest.mark.parametrize("row", [",A", ",A,2024-05-24,extra"])
+def test_simple_archive_from_csv_path_fails_on_wrong_row_length(
+    tmp_path: Path, row: str
+) -> None:
+    csv_path = tmp_path / "simple.csv"
+    csv_path.write_text(f"files,dc.title,dc.date.issued\n,B,2024\n{row}\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="row 3 has"):
+        SimpleArchive.from_csv_path(csv_path)
+
+
 @pytest.fixture(name="simple_archive")
 def fixture_simple_archive() -> SimpleArchive:
     data = {
@@ -65,7 +121,9 @@ def test_simple_archive_write_to_path(simple_archive: SimpleArchive) -> None:
     simple_archive.write_to_path(output)
 
     contents_path = output / "item_000/contents"
-    assert contents_path.exists()
+    assert contents_path.read_text(encoding="utf-8") == "values.txt\n"
+    copied_path = output / "item_000/values.txt"
+    assert copied_path.read_bytes() == Path("tests/data/values.txt").read_bytes()
     root = ET.parse(output / "item_000/dublin_core.xml").getroot()
     _assert_schema_element_value(root, "dc", "./dcvalue[@element='title']", "Empty")
 
@@ -104,6 +162,7 @@ def test_simple_archive_write_to_zip(simple_archive: SimpleArchive) -> None:
     simple_archive.write_to_zip(output)
 
     with zipfile.ZipFile(output) as zipf:
+        assert zipf.read("item_000/contents") == b"values.txt\n"
         with zipf.open("item_000/dublin_core.xml") as dc_file:
             root = ET.parse(dc_file).getroot()
             _assert_schema_element_value(root, "dc", "./dcvalue[@element='title']", "Empty")
@@ -134,6 +193,65 @@ def test_simple_archive_write_to_zip(simple_archive: SimpleArchive) -> None:
             )
 
 
+def test_simple_archive_write_to_zip_stores_compressed_files(tmp_path: Path) -> None:
+    (tmp_path / "image.png").write_bytes(b"\x89PNG" * 100)
+    (tmp_path / "text.txt").write_text("text " * 100, encoding="utf-8")
+    item = Item(**{"files": "image.png||text.txt", "dc.title": "Compressed"})
+    simple_archive = SimpleArchive(input_folder=tmp_path, items=[item])
+
+    output = tmp_path / "archive.zip"
+    simple_archive.write_to_zip(output)
+
+    with zipfile.ZipFile(output) as zipf:
+        assert zipf.getinfo("item_000/image.png").compress_type == zipfile.ZIP_STORED
+        assert zipf.getinfo("item_000/text.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.getinfo("item_000/dublin_core.xml").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.read("item_000/image.png") == b"\x89PNG" * 100
+
+
+@pytest.mark.parametrize(
+    ("compression", "compress_type"),
+    [(ZipCompression.DEFLATE, zipfile.ZIP_DEFLATED), (ZipCompression.STORE, zipfile.ZIP_STORED)],
+)
+def test_simple_archive_write_to_zip_compression(
+    simple_archive: SimpleArchive,
+    tmp_path: Path,
+    compression: ZipCompression,
+    compress_type: int,
+) -> None:
+    output = tmp_path / "archive.zip"
+    simple_archive.write_to_zip(output, compression=compression)
+
+    with zipfile.ZipFile(output) as zipf:
+        assert zipf.getinfo("item_000/dublin_core.xml").compress_type == compress_type
+        assert zipf.read("item_000/values.txt") == b"values"
+
+
+@pytest.mark.skipif(hasattr(zipfile, "ZIP_ZSTANDARD"), reason="zipfile supports zstd")
+def test_simple_archive_write_to_zip_zstd_unsupported(
+    simple_archive: SimpleArchive, tmp_path: Path
+) -> None:
+    with pytest.raises(ValueError, match="zstd"):
+        simple_archive.write_to_zip(tmp_path / "archive.zip", compression=ZipCompression.ZSTD)
+
+
+@pytest.mark.parametrize(
+    ("compression", "compresslevel"),
+    [(ZipCompression.DEFLATE, 10), (ZipCompression.DEFLATE, -2), (ZipCompression.STORE, 1)],
+)
+def test_simple_archive_write_to_zip_fails_on_invalid_compresslevel(
+    simple_archive: SimpleArchive,
+    tmp_path: Path,
+    compression: ZipCompression,
+    compresslevel: int,
+) -> None:
+    output = tmp_path / "archive.zip"
+    with pytest.raises(ValueError, match="compresslevel"):
+        simple_archive.write_to_zip(output, compresslevel=compresslevel, compression=compression)
+
+    assert not output.exists()
+
+
 def _assert_schema_element_value(
     root: ET.Element,
     expected_schema: str,
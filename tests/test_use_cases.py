@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from simple_archive.simple_archive import ZipCompression
+from simple_archive.use_cases import CreateSimpleArchiveFromCSVWriteToPath, create_unique_path
+
+
+def test_create_simple_archive_fails_on_invalid_compresslevel_before_any_work(
+    tmp_path: Path,
+) -> None:
+    output_path = tmp_path / "output" / "archive.zip"
+    uc = CreateSimpleArchiveFromCSVWriteToPath()
+
+    # the csv doesn't exist, so reading it would fail with FileNotFoundError
+    with pytest.raises(ValueError, match="compresslevel"):
+        uc.execute(
+            tmp_path / "missing.csv",
+            output_path,
+            create_zip=True,
+            compresslevel=1,
+            compression=ZipCompression.STORE,
+        )
+
+    assert not output_path.parent.exists()
+
+
+def test_create_unique_path_missing_base_path(tmp_path: Path) -> None:
+    base_path = tmp_path / "output"
+
+    assert create_unique_path(base_path, "simple") == base_path / "simple"
+
+
+def test_create_unique_path_skips_existing(tmp_path: Path) -> None:
+    (tmp_path / "simple").mkdir()
+    (tmp_path / "simple.001").mkdir()
+    (tmp_path / "simple.zip").touch()
+
+    assert create_unique_path(tmp_path, "simple") == tmp_path / "simple.002"
+    assert create_unique_path(tmp_path, "simple", "zip") == tmp_path / "simple.001.zip"
+
+
+def test_create_unique_path_ignores_case(tmp_path: Path) -> None:
+    (tmp_path / "Data.zip").touch()
+
+    assert create_unique_path(tmp_path, "data", "zip") == tmp_path / "data.001.zip"